@@ -23,7 +23,8 @@ class EngagementManager:
 
         self.load_settings()
 
-        self.last_message_time = 0
+        # Interval/cooldown math uses time.monotonic(), which NTP or sleep/resume can't move backwards
+        self.last_message_time = float("-inf")
         self.next_message_time = 0 
         self.message_history = deque(maxlen=max(1, len(self.fallback_messages)))
         
@@ -54,7 +55,7 @@ class EngagementManager:
     def _set_next_interval(self):
         # Random interval between min_interval and max_interval
         interval = random.randint(self.min_interval, self.max_interval)
-        self.next_message_time = time.time() + interval
+        self.next_message_time = time.monotonic() + interval
         # print(f"Next engagement message in {interval}s")
 
     async def get_next_message(self):
@@ -62,7 +63,7 @@ class EngagementManager:
         Returns a message if the random interval has passed.
         Uses LLM if available, otherwise fallback.
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if current_time < self.next_message_time:
             return None
@@ -90,9 +91,9 @@ class EngagementManager:
         
         if trigger:
             # Enforce a smaller rate limit for triggers (e.g., don't spam if 2 triggers in 5 mins)
-            if time.time() - self.last_message_time > 300:
+            if time.monotonic() - self.last_message_time > 300:
                 msg = await self._generate_message(category="welcome" if trigger else None)
-                self.last_message_time = time.time()
+                self.last_message_time = time.monotonic()
                 # Push back the periodic message timer
                 self._set_next_interval() 
                 return msg
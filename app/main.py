@@ -9,6 +9,18 @@ from app.settings import settings
 from app.youtube_client import YouTubeClient
 from app.router import MessageRouter
 
+def new_event_loop():
+    """
+    Returns a uvloop event loop when uvloop is installed (Linux/macOS), otherwise a stock asyncio loop.
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            pass
+    return asyncio.new_event_loop()
+
 async def main():
     print(f"=== Starting {settings.BOT_NAME} ===")
     
@@ -96,12 +108,16 @@ async def main():
         while True:
             try:
                 if youtube.video_id:
-                    viewers, likes = youtube.get_video_stats(youtube.video_id)
-                    
                     # Assume channel ID from settings or fetch from video details if needed
                     # ideally we store channel_id in youtube client once found
                     channel_id = settings.STREAMER_CHANNEL_ID
-                    subs = youtube.get_channel_subscribers(channel_id) if channel_id else 0
+                    # Video and channel stats share one batched round-trip
+                    stats = youtube.get_stream_stats(youtube.video_id, channel_id)
+                    if stats is None:
+                        # Lookup was refused or failed, try again next round instead of acting on zeros
+                        await asyncio.sleep(120)
+                        continue
+                    viewers, likes, subs = stats
                     
                     # 1. Check Targets (Highest Priority)
                     target_msg = await engagement.check_targets(likes, subs)
@@ -146,6 +162,7 @@ if __name__ == "__main__":
     try:
         if sys.platform == "win32":
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("Bot Interrupted.")
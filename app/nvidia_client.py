@@ -1,7 +1,51 @@
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+import importlib.util
 import random
+import re
+from cachetools import TTLCache
 from app.settings import settings
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+# Keep idle connections open across quiet stretches of chat so the next reply skips the TLS handshake.
+# HTTP/2 multiplexes concurrent handler requests over one connection when the h2 package is installed
+_HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=300)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# AsyncOpenAI clients keyed by API key, so every NvidiaClient (bot loop, radio
+# script generator, engagement trigger) reuses one SDK client and connection pool
+_clients = {}
+
+def _get_client(api_key: str) -> AsyncOpenAI:
+    client = _clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            base_url=NVIDIA_BASE_URL,
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(http2=_HTTP2, limits=_HTTP_LIMITS)
+        )
+        _clients[api_key] = client
+    return client
+
+def _normalize_message(message: str) -> str:
+    """
+    Lowercases and collapses whitespace so trivially different chat lines share a cache key.
+    """
+    return _WHITESPACE_RE.sub(" ", message.strip().lower())
+
+def _response_text(response):
+    """
+    Returns the stripped text of the first choice, or None if the model returned nothing.
+    """
+    if response.choices:
+        content = response.choices[0].message.content
+        if content:
+            return content.strip()
+    return None
+
 class NvidiaClient:
     def __init__(self, model_name=None):
         self.model_name = model_name or settings.NVIDIA_MODEL_ID
@@ -11,10 +55,7 @@ class NvidiaClient:
         if not api_key:
             from app.settings import DEFAULT_NVIDIA_API_KEY
             api_key = DEFAULT_NVIDIA_API_KEY
-        self.client = AsyncOpenAI(
-            base_url="https://integrate.api.nvidia.com/v1",
-            api_key=api_key
-        )
+        self.client = _get_client(api_key)
         self.stream_context = {}
         self.channel_knowledge = {
             "latest_videos": [],
@@ -27,6 +68,9 @@ class NvidiaClient:
             "🤖 *beeping noises*",
             "Need to recharge! 🔋"
         ]
+        # Normalized messages the model already decided to ignore (e.g. "lol", "gg"),
+        # so repeats skip the LLM round trip entirely
+        self.ignored_messages = TTLCache(maxsize=512, ttl=3600)
         print(f"initialized NvidiaClient with model: {self.model_name}")
 
     async def generate_reply(self, user: str, message: str, history: str = "", is_mentioned: bool = False, user_memory: str = "") -> str:
@@ -34,6 +78,12 @@ class NvidiaClient:
         Generates a friendly, short reply.
         Handles context-aware dynamic jumping into chat.
         """
+        cache_key = None
+        if not is_mentioned:
+            cache_key = _normalize_message(message)
+            if cache_key in self.ignored_messages:
+                return "IGNORE_CHAT"
+
         context_str = ""
         if self.stream_context:
             title = self.stream_context.get("title", "Unknown Stream")
@@ -144,19 +194,20 @@ class NvidiaClient:
                 max_tokens=400
             )
             
-            if response.choices and response.choices[0].message.content:
-                reply = response.choices[0].message.content.strip()
-                
+            reply = _response_text(response)
+            if reply:
                 # HARD FILTER
                 if reply.upper() == "IGNORE_CHAT":
                     if is_mentioned:
                         return f"Hey @{user.lstrip('@')}! I'm here. How can I help you?"
+                    self.ignored_messages[cache_key] = True
                     return "IGNORE_CHAT"
                 
                 # Extra safety: ignore short/generic replies unless directly mentioned
                 if not is_mentioned:
                     low_value = ["lol", "nice", "haha", "cool"]
                     if reply.lower() in low_value:
+                        self.ignored_messages[cache_key] = True
                         return "IGNORE_CHAT"
                     
                 return reply
@@ -202,8 +253,9 @@ class NvidiaClient:
                 temperature=0.8,
                 max_tokens=500
             )
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content.strip().replace('"', '')
+            text = _response_text(response)
+            if text:
+                return text.replace('"', '')
             return None
         except Exception as e:
             # print(f"Nvidia Engagement Error: {e}")
@@ -235,8 +287,9 @@ class NvidiaClient:
                 temperature=0.7,
                 max_tokens=1000
             )
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content.strip().replace('"', '')
+            text = _response_text(response)
+            if text:
+                return text.replace('"', '')
             return f"Welcome to the airwaves, {user}! Let's keep the gaming vibes high!"
         except Exception as e:
             print(f"Nvidia NIM Radio Reply Error: {e}")
@@ -253,9 +306,7 @@ class NvidiaClient:
                 temperature=0.5,
                 max_tokens=500
             )
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content.strip()
-            return None
+            return _response_text(response)
         except Exception as e:
             print(f"Nvidia Custom Prompt Error: {e}")
             return None
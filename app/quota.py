@@ -0,0 +1,156 @@
+import time
+import threading
+import orjson
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from app.settings import settings
+
+# YouTube Data API v3 quota cost per endpoint (units)
+COST_TABLE = {
+    "search.list": 100,
+    "videos.list": 1,
+    "channels.list": 1,
+    "subscriptions.list": 1,
+    "liveBroadcasts.list": 1,
+    "liveChatMessages.list": 5,
+    "liveChatMessages.insert": 50,
+    "liveChatMessages.delete": 50,
+    "liveChatBans.insert": 50,
+}
+
+# Extra units charged when the server rejects a call for quota or rate reasons
+REJECTION_PENALTY = 50
+
+# 403 reasons that are rate limits rather than permission problems, safe to retry after backing off
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded", "dailyLimitExceeded"}
+
+def http_error_reason(error):
+    """
+    Returns the first error reason (e.g. 'quotaExceeded') from an HttpError, or None.
+    """
+    try:
+        data = orjson.loads(error.content)
+        return data["error"]["errors"][0]["reason"]
+    except Exception:
+        return None
+
+class QuotaExceeded(Exception):
+    """
+    Raised when a YouTube API call would exceed the local daily quota budget or burst limit.
+    `retry_after` is a hint in seconds when the refusal clears quickly (burst limit), otherwise None.
+    """
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously: tokens = min(capacity, tokens + elapsed * rate).
+    """
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def allow(self, cost):
+        """
+        Takes `cost` tokens if available. Returns False (taking nothing) otherwise.
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens < cost:
+                return False
+            self.tokens -= cost
+            return True
+
+    def refund(self, cost):
+        """
+        Gives back tokens taken by allow() for a call that was not made after all.
+        """
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + cost)
+
+    def time_until(self, cost):
+        """
+        Returns the seconds until `cost` tokens will be available (0 if they already are).
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= cost:
+                return 0.0
+            if self.rate <= 0:
+                return None
+            return (cost - self.tokens) / self.rate
+
+    def penalize(self, cost):
+        """
+        Removes tokens without checking, e.g. after the server rejected a call.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = max(0.0, self.tokens - cost)
+
+# Shared daily budget for every YouTube client in this process
+bucket = TokenBucket(
+    capacity=settings.YOUTUBE_DAILY_QUOTA,
+    rate=settings.YOUTUBE_DAILY_QUOTA / 86400
+)
+
+# Short-term limiter on top of the daily budget, so polling plus a burst of replies
+# or a discovery lookup can't spend units fast enough to trip server-side 429s
+BURST_CAPACITY = 300
+BURST_RATE = 5 # units per second
+burst = TokenBucket(capacity=BURST_CAPACITY, rate=BURST_RATE)
+
+def charge(endpoint):
+    """
+    Reserves quota for one call to `endpoint` or raises QuotaExceeded.
+    """
+    cost = COST_TABLE.get(endpoint, 1)
+    if not burst.allow(cost):
+        raise QuotaExceeded(
+            f"YouTube API calls are bursting, skipping {endpoint} ({cost} units)",
+            retry_after=burst.time_until(cost)
+        )
+    if not bucket.allow(cost):
+        burst.refund(cost)
+        raise QuotaExceeded(f"Local YouTube quota budget exhausted, skipping {endpoint} ({cost} units)")
+
+def penalize_rejection(error):
+    """
+    Charges REJECTION_PENALTY for an HttpError that is a 429 or a quota/rate-limit 403.
+    Other 403s (liveChatEnded, forbidden, insufficientPermissions, ...) don't burn quota.
+    """
+    status = error.resp.status
+    if status == 429 or (status == 403 and http_error_reason(error) in RATE_LIMIT_REASONS):
+        bucket.penalize(REJECTION_PENALTY)
+
+def refund(endpoint):
+    """
+    Gives back the units charge() reserved for `endpoint` when the call was not made after all.
+    """
+    cost = COST_TABLE.get(endpoint, 1)
+    bucket.refund(cost)
+    burst.refund(cost)
+
+class QuotaHttpRequest(HttpRequest):
+    """
+    HttpRequest that charges the shared budget before every execute().
+    Passed to build(requestBuilder=...) so every resource and method is gated in one place.
+    """
+    def execute(self, http=None, num_retries=0):
+        # methodId looks like "youtube.liveChatMessages.list"
+        charge(self.methodId.split(".", 1)[-1])
+        try:
+            return super().execute(http=http, num_retries=num_retries)
+        except HttpError as e:
+            # Rate-limited calls still burn server-side quota, back off harder
+            penalize_rejection(e)
+            raise
@@ -1,10 +1,16 @@
 import asyncio
 import time
 import collections
+from cachetools import TTLCache
 from app.settings import settings
 from app.moderation_filter import ModerationFilter
 from app.database import DatabaseManager
 
+# YouTube rejects live chat messages longer than this
+MAX_REPLY_CHARS = 200
+# Seconds between attempts to look up the bot's own channel ID after a failure
+BOT_CHANNEL_ID_RETRY = 300
+
 class MessageRouter:
     def __init__(self, gemini_client=None, youtube_client=None, tts_callback=None):
         self.gemini_client = gemini_client
@@ -12,10 +18,18 @@ class MessageRouter:
         self.tts_callback = tts_callback
         self.db = DatabaseManager()
         self.bot_name = settings.BOT_NAME.lower()
-        self.cooldowns = {}
+        # Bot's own channel ID, resolved lazily off the event loop (see _get_bot_channel_id)
+        self.bot_channel_id = None
+        self._bot_channel_id_retry_at = float("-inf") # time.monotonic() of the next lookup attempt
         self.COOLDOWN_SECONDS = getattr(settings, 'COOLDOWN_SECONDS', 60)
+        # Users currently on cooldown. Entries expire after COOLDOWN_SECONDS and the
+        # cache is size-bounded, so viewers seen once don't stay in memory for the whole stream
+        self.cooldowns = TTLCache(maxsize=10000, ttl=self.COOLDOWN_SECONDS)
+        # Authors with an LLM reply to a non-mention being generated. Handlers share one event loop,
+        # so the check-and-add below cannot interleave and needs no lock
+        self.generating_for = set()
         self.chat_history = collections.deque(maxlen=15)
-        self.last_radio_time = 0
+        self.last_radio_time = float("-inf") # time.monotonic() of the last !radio
         
         # Per-user recent history for summarization (10 messages trigger)
         self.user_session_history = collections.defaultdict(lambda: collections.deque(maxlen=10))
@@ -69,13 +83,12 @@ class MessageRouter:
 
         # 0. Self-Reply Prevention
         # Ignore messages from the bot itself
-        # Debug: Check exact values
-        if user:
-            # check for partial match too?
-            if user.lower() == self.bot_name or self.bot_name in user.lower() or "nightbot" in user.lower():
-                print(f"[Router Ignore] Ignored message from {user}")
-                return
-            # print(f"[Debug] Message from: '{user}' (Bot name: '{self.bot_name}')")
+        if user_id and user_id == await self._get_bot_channel_id():
+            return
+        user_lower = user.lower() if user else ""
+        if self.bot_name in user_lower or "nightbot" in user_lower:
+            print(f"[Router Ignore] Ignored message from {user}")
+            return
 
         # 0.5 Moderation Check
         if ModerationFilter.check_message(message):
@@ -89,14 +102,13 @@ class MessageRouter:
             return
 
         # 1. Mention Detection
-        user_lower = user.lower() if user else ""
         message_lower = message.lower()
         
         print(f"[Router Parse] User: {user}, Message: {message}")
         
-        is_mentioned = False
-        if f"@{self.bot_name}" in message_lower or self.bot_name in message_lower:
-            is_mentioned = True
+        # A plain substring check also covers "@botname", one C-level scan per message
+        is_mentioned = self.bot_name in message_lower
+        if is_mentioned:
             print(f"[{user}] explicitly mentioned bot: {message}")
 
         # 2. Database Tracking & Memory Fetch
@@ -207,7 +219,7 @@ class MessageRouter:
                         self.youtube_client.send_message(reply)
                     return
                 
-                now = time.time()
+                now = time.monotonic()
                 elapsed_cooldown = now - self.last_radio_time
                 if elapsed_cooldown < 30:
                     remaining = int(30 - elapsed_cooldown)
@@ -235,7 +247,8 @@ class MessageRouter:
                 reply_text = await self.gemini_client.generate_radio_reply(user, query, model_id=radio_model)
                 
                 # Send text response to chat
-                chat_reply = f"@{user} [Radio] {reply_text}"
+                radio_prefix = f"@{user} [Radio] "
+                chat_reply = self._truncate_reply(radio_prefix + reply_text, len(radio_prefix))
                 if self.youtube_client:
                     self.youtube_client.send_message(chat_reply)
                 
@@ -267,37 +280,55 @@ class MessageRouter:
 
         # 4. Context-Aware AI Generation (Evaluate BEFORE Cooldown)
         if self.gemini_client:
-            print(f"Evaluating message from {user} for context-aware reply...")
-            history_str = "\n".join(self.chat_history)
-            
-            # Injecting User Memory into the generation
-            reply = await self.gemini_client.generate_reply(
-                user, 
-                message, 
-                history=history_str, 
-                is_mentioned=is_mentioned,
-                user_memory=user_memory
-            )
-            
-            if reply and "IGNORE_CHAT" not in reply:
-                # 5. Cooldown Check (Only enforced if AI decides to speak)
-                if self._is_on_cooldown(user) and not is_mentioned:
-                    print(f"Bot wanted to reply, but {user} is on cooldown. Skipping to avoid spam.")
-                    return
+            if is_mentioned:
+                # Direct @mentions always get their own reply, even mid-burst
+                await self._generate_and_send(user, message, is_mentioned, user_memory)
+                return
+            author_key = user_id or user
+            if author_key in self.generating_for:
+                print(f"[Router Skip] Reply for {user} already being generated, skipping burst message.")
+                return
+            self.generating_for.add(author_key)
+            try:
+                await self._generate_and_send(user, message, is_mentioned, user_memory)
+            finally:
+                self.generating_for.discard(author_key)
 
-                mention_reply = self._format_mention(user, reply)
-                print(f"Bot Context-Aware Reply: {mention_reply}")
-                
-                # Append bot output to memory
-                self.chat_history.append(f"{self.bot_name}: {mention_reply}")
+    async def _generate_and_send(self, user, message, is_mentioned, user_memory):
+        """
+        Asks the LLM whether and how to reply to a chat message, then posts the reply.
+        """
+        print(f"Evaluating message from {user} for context-aware reply...")
+        history_str = "\n".join(self.chat_history)
+        
+        # Injecting User Memory into the generation
+        reply = await self.gemini_client.generate_reply(
+            user, 
+            message, 
+            history=history_str, 
+            is_mentioned=is_mentioned,
+            user_memory=user_memory
+        )
+        
+        if reply and "IGNORE_CHAT" not in reply:
+            # 5. Cooldown Check (Only enforced if AI decides to speak)
+            if self._is_on_cooldown(user) and not is_mentioned:
+                print(f"Bot wanted to reply, but {user} is on cooldown. Skipping to avoid spam.")
+                return
 
-                if self.youtube_client:
-                    self.youtube_client.send_message(mention_reply)
-                else:
-                    print("YouTube Client not connected, cannot send reply.")
+            mention_reply = self._format_mention(user, reply)
+            print(f"Bot Context-Aware Reply: {mention_reply}")
+
+            # Append bot output to memory
+            self.chat_history.append(f"{self.bot_name}: {mention_reply}")
+
+            if self.youtube_client:
+                self.youtube_client.send_message(mention_reply)
             else:
-                # Bot decided not to intervene
-                pass
+                print("YouTube Client not connected, cannot send reply.")
+        else:
+            # Bot decided not to intervene
+            pass
 
     async def _summarize_user(self, user_id: str, display_name: str):
         """
@@ -331,14 +362,31 @@ class MessageRouter:
         except Exception as e:
             print(f"Error during iterative summarization for {display_name}: {e}")
 
+    async def _get_bot_channel_id(self):
+        """
+        Returns the bot's channel ID, looking it up in an executor thread on first use.
+        A failed lookup is retried at most every BOT_CHANNEL_ID_RETRY seconds; until then
+        the author-name check in route_message is the only self-reply guard.
+        """
+        if self.bot_channel_id or not self.youtube_client:
+            return self.bot_channel_id
+        now = time.monotonic()
+        if now < self._bot_channel_id_retry_at:
+            return None
+        # Set before awaiting so concurrent handlers don't start duplicate lookups
+        self._bot_channel_id_retry_at = now + BOT_CHANNEL_ID_RETRY
+        try:
+            loop = asyncio.get_running_loop()
+            self.bot_channel_id = await loop.run_in_executor(None, self.youtube_client.get_own_channel_id)
+        except Exception as e:
+            print(f"[Router] Could not resolve bot channel ID: {e}")
+        return self.bot_channel_id
+
     def _is_on_cooldown(self, user: str) -> bool:
-        now = time.time()
-        last_time = self.cooldowns.get(user, 0)
-        
-        if now - last_time < self.COOLDOWN_SECONDS:
+        if user in self.cooldowns:
             return True
         
-        self.cooldowns[user] = now
+        self.cooldowns[user] = True
         return False
 
     def _format_mention(self, user: str, reply: str) -> str:
@@ -354,15 +402,35 @@ class MessageRouter:
         
         if reply_lower.startswith(f"@{prefix_to_check}"):
             rest_of_reply = clean_reply[len(f"@{prefix_to_check}"):].strip()
-            return f"@{clean_user} {rest_of_reply}"
         elif reply_lower.startswith(f"@ {prefix_to_check}"):
             rest_of_reply = clean_reply[len(f"@ {prefix_to_check}"):].strip()
-            return f"@{clean_user} {rest_of_reply}"
         elif reply_lower.startswith(prefix_to_check):
             rest_of_reply = clean_reply[len(prefix_to_check):].strip()
-            return f"@{clean_user} {rest_of_reply}"
         else:
-            return f"@{clean_user} {clean_reply}"
+            rest_of_reply = clean_reply
+        prefix = f"@{clean_user} "
+        return self._truncate_reply(prefix + rest_of_reply, len(prefix))
+
+    def _truncate_reply(self, reply: str, prefix_len: int = 0) -> str:
+        """
+        Cuts a reply down to MAX_REPLY_CHARS. The first `prefix_len` chars (the '@user ' mention)
+        are never a cut point. Ends on a full sentence when one ends past half the limit,
+        otherwise on the last word boundary with an ellipsis.
+        """
+        if len(reply) <= MAX_REPLY_CHARS:
+            return reply
+        cut = reply[:MAX_REPLY_CHARS]
+        # A sentence end this early would throw away most of the usable reply
+        floor = max(prefix_len, MAX_REPLY_CHARS // 2)
+        # rfind is a single C-level scan per terminator, no intermediate lists
+        idx = max(cut.rfind(".", floor), cut.rfind("!", floor), cut.rfind("?", floor))
+        if idx >= floor:
+            return cut[:idx + 1]
+        head = reply[:MAX_REPLY_CHARS - 1]
+        space = head.rfind(" ", prefix_len)
+        if space > prefix_len:
+            head = head[:space].rstrip()
+        return head + "…"
 
     def _speak_text_sapi5(self, text):
         import subprocess
@@ -27,6 +27,7 @@ class Settings(BaseSettings):
     NVIDIA_MODEL_ID: str = "openai/gpt-oss-120b"
     BOT_NAME: str = "AxiBot"
     COOLDOWN_SECONDS: int = 60
+    YOUTUBE_DAILY_QUOTA: int = 10000 # Daily YouTube Data API units the bot may spend
     ENABLE_DATABASE: bool = True
     ENABLE_COMMANDS: bool = True
     RADIO_MODEL_ID: str = "openai/gpt-oss-120b"
@@ -95,6 +96,7 @@ def save_local_settings():
         "NVIDIA_MODEL_ID": settings.NVIDIA_MODEL_ID,
         "BOT_NAME": settings.BOT_NAME,
         "COOLDOWN_SECONDS": settings.COOLDOWN_SECONDS,
+        "YOUTUBE_DAILY_QUOTA": settings.YOUTUBE_DAILY_QUOTA,
         "ENABLE_DATABASE": settings.ENABLE_DATABASE,
         "ENABLE_COMMANDS": settings.ENABLE_COMMANDS,
         "RADIO_MODEL_ID": settings.RADIO_MODEL_ID,
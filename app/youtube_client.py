@@ -1,21 +1,140 @@
 import os
 import json
+import tempfile
+import asyncio
+import threading
+import time
 from datetime import datetime, timezone
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, quote
+import httplib2
+import httpx
+import orjson
+from google.auth.transport.requests import Request
 from googleapiclient.errors import HttpError
 from app.settings import settings
+from app import yt_service
+from app import quota
+from app.quota import QuotaExceeded, RATE_LIMIT_REASONS, http_error_reason
+
+LIVE_CHAT_MESSAGES_URL = "https://youtube.googleapis.com/youtube/v3/liveChat/messages"
+# Partial-response mask for chat polls: only what YouTubeChatListener._parse_item and the
+# polling loop read. Doesn't change quota, but cuts the bytes transferred and parsed per poll
+LIVE_CHAT_FIELDS = (
+    "nextPageToken,pollingIntervalMillis,"
+    "items(id,"
+    "snippet(type,publishedAt,textMessageDetails/messageText,"
+    "superChatDetails(amountDisplayString,userComment),"
+    "superStickerDetails/amountDisplayString,"
+    "memberMilestoneChatDetails(userComment,memberLevelName)),"
+    "authorDetails(displayName,channelId))"
+)
+
+# Live chat details per broadcast (video) id, shared by every client in this process
+_live_chats = {}
+# Single-flight for discovery lookups: concurrent callers wait for the one in progress,
+# then find its result in the cache instead of spending quota on the same calls
+_discovery_lock = threading.Lock()
+
+# Seconds between access token expiry checks on the chat polling path, also the refresh headroom
+TOKEN_CHECK_INTERVAL = 300
+
+# A saved chat page token is only resumed after a quick restart. After a longer gap the
+# first page is treated as history instead of replaying everything said while offline
+PAGE_TOKEN_MAX_AGE = 300 # seconds
+
+# search.list costs 100 units, so the fallback discovery path runs at most this often (seconds)
+SEARCH_FALLBACK_INTERVAL = 1800
+_last_search_fallback = None # time.monotonic() of the last search.list fallback
+
+# Error reasons meaning the live chat is gone and must be rediscovered
+CHAT_GONE_REASONS = {"liveChatEnded", "liveChatNotFound", "liveChatDisabled"}
+
+def classify_http_error(error):
+    """
+    Sorts an HttpError into what the caller should do about it:
+    'retry' (408/429/5xx/rate limits, back off), 'refresh' (401, renew the access token),
+    'gone' (404 or chat ended, rediscover the live chat) or 'fatal' (any other 4xx, stop).
+    """
+    status = error.resp.status
+    reason = http_error_reason(error)
+    if status == 404 or reason in CHAT_GONE_REASONS:
+        return "gone"
+    if status == 401:
+        return "refresh"
+    if status in (408, 429) or status >= 500 or reason in RATE_LIMIT_REASONS:
+        return "retry"
+    return "fatal"
+
+# A chat send the server refused without posting (429, 503 with Retry-After, rate-limit 403)
+# is retried once on the event loop after the server's delay, or this default when it gave none
+SEND_RETRY_DELAY = 5 # seconds
+# Longer delays are not worth waiting for, the reply would arrive after the conversation moved on
+SEND_RETRY_MAX_DELAY = 60 # seconds
+
+def send_retry_delay(error):
+    """
+    Returns how long to wait before re-sending a chat message rejected with `error`, or None
+    when the rejection doesn't guarantee the message was not posted (so a retry could double-post).
+    """
+    status = error.resp.status
+    delay = retry_after_seconds(error)
+    if status == 429 or (status == 403 and http_error_reason(error) in RATE_LIMIT_REASONS):
+        return SEND_RETRY_DELAY if delay is None else delay
+    if status == 503 and delay is not None:
+        return delay
+    return None
+
+def retry_after_seconds(error):
+    """
+    Returns the server's requested retry delay in seconds from an HttpError's
+    retry-after-ms or Retry-After header (delta-seconds or HTTP-date), or None if absent.
+    """
+    headers = error.resp
+    try:
+        if "retry-after-ms" in headers:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
 
 class YouTubeClient:
     CACHE_FILE = "storage/cache.json"
 
     def __init__(self):
-        self.youtube = self._authenticate()
+        self._authenticated = self._authenticate() is not None
         self.live_chat_id = None
         self.video_id = None
         self.stream_start_time = None
+        self._http = None # httpx.AsyncClient used for chat polling, created on first use
+        self._chat_url = None # (live_chat_id, encoded chat poll URL without the page token)
+        self._token_creds = None # Credentials last checked by _bearer_token()
+        self._token_check_at = 0 # time.monotonic() before which that token is known to be fresh
+        self.channel_id = None # Bot account's own channel ID, see get_own_channel_id()
+        self.on_message_sent = None # Called after a successful send_message, e.g. to wake the chat poller
         self._ensure_storage_dir()
 
+    @property
+    def youtube(self):
+        """
+        The bot account's YouTube service for the calling thread. Listener lookups run in executor
+        threads while the event loop keeps sending, and httplib2 transports can't be shared across threads.
+        """
+        if not self._authenticated:
+            return None
+        try:
+            return yt_service.get_youtube(settings.YOUTUBE_TOKEN_PATH, slot=yt_service.thread_slot())
+        except Exception as e:
+            print(f"YouTube Auth Error: {e}")
+            return None
+
     def _ensure_storage_dir(self):
         if not os.path.exists("storage"):
             os.makedirs("storage")
@@ -27,33 +146,90 @@ class YouTubeClient:
             return None
 
         try:
-            creds = Credentials.from_authorized_user_file(token_path)
-            return build("youtube", "v3", credentials=creds)
+            return yt_service.get_youtube(token_path, slot=yt_service.thread_slot())
         except Exception as e:
             # Check for RefreshError (Token expired/revoked)
             if "Token has been expired or revoked" in str(e):
                 print(f"Error: Token expired. Deleting {token_path}. Please run auth_helper.py again.")
+                yt_service.reset(token_path)
                 if os.path.exists(token_path):
                     os.remove(token_path)
             else:
                 print(f"YouTube Auth Error: {e}")
             return None
 
-    def get_new_client(self):
+    async def _bearer_token(self, force_refresh=False):
         """
-        Returns a newly authenticated, independent YouTube service object.
-        Used to prevent SSL thread-safety issues when making API calls from background threads.
+        Returns a valid OAuth access token for the bot account, refreshing it off the event loop if needed.
         """
-        token_path = settings.YOUTUBE_TOKEN_PATH
-        if not os.path.exists(token_path):
-            return None
-        try:
-            from google.oauth2.credentials import Credentials
-            from googleapiclient.discovery import build
-            creds = Credentials.from_authorized_user_file(token_path)
-            return build("youtube", "v3", credentials=creds)
-        except Exception:
-            return None
+        creds = yt_service.get_credentials(settings.YOUTUBE_TOKEN_PATH)
+        now = time.monotonic()
+        if not force_refresh and creds is self._token_creds and now < self._token_check_at:
+            # One clock compare per poll instead of the expiry datetime math in creds.valid
+            return creds.token
+
+        if force_refresh or not creds.valid:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, creds.refresh, Request())
+
+        # Skip the expiry probe until 5 minutes before the token expires (rechecking at least every 5 minutes)
+        fresh_for = TOKEN_CHECK_INTERVAL
+        if creds.expiry:
+            seconds_left = (creds.expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+            fresh_for = min(fresh_for, max(0, seconds_left - TOKEN_CHECK_INTERVAL))
+        self._token_creds = creds
+        self._token_check_at = now + fresh_for
+        return creds.token
+
+    async def list_chat_messages(self, live_chat_id, page_token=None):
+        """
+        Fetches one page of live chat messages over httpx without blocking the event loop.
+        Non-200 responses are raised as HttpError so callers handle them like googleapiclient errors.
+        """
+        quota.charge("liveChatMessages.list")
+
+        # The query only changes with the chat, so it is encoded once and just the page token is appended per poll
+        if self._chat_url is None or self._chat_url[0] != live_chat_id:
+            query = urlencode({
+                "liveChatId": live_chat_id,
+                "part": "snippet,authorDetails",
+                "maxResults": 2000, # Same 5 units per call, so take as much of a busy chat as possible
+                "fields": LIVE_CHAT_FIELDS
+            })
+            self._chat_url = (live_chat_id, f"{LIVE_CHAT_MESSAGES_URL}?{query}")
+        url = self._chat_url[1]
+        if page_token:
+            url = f"{url}&pageToken={quote(page_token, safe='')}"
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=30)
+
+        token = await self._bearer_token()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await self._http.get(url, headers=headers)
+        if response.status_code != 200:
+            resp = httplib2.Response(dict(response.headers))
+            resp.status = response.status_code
+            resp.reason = response.reason_phrase
+            error = HttpError(resp, response.content, uri=str(response.url))
+            quota.penalize_rejection(error)
+            raise error
+        return orjson.loads(response.content)
+
+    async def aclose(self):
+        """
+        Closes the chat polling connection pool. A later poll opens a new one.
+        """
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+
+    async def refresh_access_token(self):
+        """
+        Renews the bot's access token after the API rejected it (401) before it looked expired.
+        """
+        await self._bearer_token(force_refresh=True)
 
     def _load_cache(self):
         if os.path.exists(self.CACHE_FILE):
@@ -66,82 +242,185 @@ class YouTubeClient:
 
     def _save_cache(self, data):
         try:
-            with open(self.CACHE_FILE, "w") as f:
+            # Write to a temp file and swap it in, so a crash mid-write never leaves a corrupt cache.
+            # Each write gets its own temp file: the listener (event loop) and discovery (executor
+            # threads) can save at the same time, and a shared name would let them interleave
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.CACHE_FILE), suffix=".tmp", delete=False) as f:
                 json.dump(data, f)
+            os.replace(f.name, self.CACHE_FILE)
         except Exception as e:
             print(f"Failed to save cache: {e}")
 
+    def save_page_token(self, page_token):
+        """
+        Stores the chat page token alongside the cached live chat so a restart resumes from it.
+        """
+        if not self.live_chat_id or not page_token:
+            return
+        self._save_cache({
+            "video_id": self.video_id,
+            "live_chat_id": self.live_chat_id,
+            "page_token": page_token,
+            "page_token_saved_at": time.time()
+        })
+
+    def load_page_token(self):
+        """
+        Returns the page token saved for the current live chat, or None if missing or older than PAGE_TOKEN_MAX_AGE.
+        """
+        cache = self._load_cache()
+        if not self.live_chat_id or cache.get("live_chat_id") != self.live_chat_id:
+            return None
+        if time.time() - cache.get("page_token_saved_at", 0) > PAGE_TOKEN_MAX_AGE:
+            return None
+        return cache.get("page_token")
+
     def get_live_chat_id_for_channel(self, channel_id):
         """
-        Searches for the active live stream on the given channel ID and returns its liveChatId.
-        Checks cache first to save API quota.
+        Finds the active live stream on the given channel ID and returns its liveChatId.
+        Checks cache first, then asks liveBroadcasts.list (1 unit), and only falls back to a
+        throttled search.list (100 units) when the broadcast lookup finds nothing.
         """
         if not self.youtube:
             return None
 
+        with _discovery_lock:
+            return self._find_live_chat_id(channel_id)
+
+    def _find_live_chat_id(self, channel_id):
         # 1. Check Cache
         cache = self._load_cache()
         cached_video_id = cache.get("video_id")
         
         if cached_video_id:
-            print(f"Checking cached live stream: {cached_video_id}")
-            # This call costs 1 unit vs 100 for search
-            chat_id = self.get_live_chat_id_by_video_id(cached_video_id)
+            details = _live_chats.get(cached_video_id)
+            if not details:
+                print(f"Checking cached live stream: {cached_video_id}")
+                # One videos.list call returns both the live chat ID and the actual start time
+                details = self.get_video_details(cached_video_id)
+            chat_id = details.get("live_chat_id") if details else None
             if chat_id:
                 print(f"Found active live stream from cache: {cached_video_id}")
+                _live_chats[cached_video_id] = details
+                self.live_chat_id = chat_id
                 self.video_id = cached_video_id
-                
-                # Fetch video details to retrieve actual start time
-                details = self.get_video_details(cached_video_id)
-                if details and details.get("actual_start_time"):
-                    self.stream_start_time = details["actual_start_time"]
-                else:
-                    self.stream_start_time = datetime.now(timezone.utc).isoformat()
-                    
+                self.stream_start_time = details.get("actual_start_time") or datetime.now(timezone.utc).isoformat()
                 return chat_id
             else:
-                print("Cached stream ended or invalid. Performing full search...")
+                print("Cached stream ended or invalid. Looking up active broadcast...")
+
+        # 2. Ask the streamer account for its active broadcast
+        streamer_client = self.get_streamer_client()
+        if not streamer_client:
+            print("Cannot detect live stream: Streamer account is not linked. Run auth_helper.py for the streamer token.")
+            return self._search_live_chat_id(channel_id)
 
-        print(f"Searching for active live stream on channel: {channel_id}...")
+        print(f"Looking up active live broadcast on channel: {channel_id}...")
         try:
-            # 2. Search for live video on the channel
-            search_response = self.youtube.search().list(
-                part="id",
-                channelId=channel_id,
-                eventType="live",
-                type="video",
-                maxResults=1
-            ).execute()
+            request = streamer_client.liveBroadcasts().list(
+                part="id,snippet",
+                broadcastStatus="active",
+                broadcastType="all",
+                maxResults=1,
+                fields="items(id,snippet(liveChatId,actualStartTime))"
+            )
+            response = request.execute()
             
-            items = search_response.get("items", [])
+            items = response.get("items", [])
             if not items:
+                # The streamer is offline. search.list would only find the same owned broadcasts
                 print("No active live stream found for this channel.")
                 return None
                 
-            video_id = items[0]["id"]["videoId"]
+            broadcast = items[0]
+            video_id = broadcast["id"]
+            snippet = broadcast.get("snippet", {})
+            chat_id = snippet.get("liveChatId")
             print(f"Found active live stream: {video_id}")
             
-            # 3. Get the liveChatId for that video
-            chat_id = self.get_live_chat_id_by_video_id(video_id)
-            
             if chat_id:
                 # Update Cache
                 self._save_cache({"video_id": video_id, "live_chat_id": chat_id})
+                self.live_chat_id = chat_id
                 self.video_id = video_id
-                
-                # Fetch video details to retrieve actual start time
-                details = self.get_video_details(video_id)
-                if details and details.get("actual_start_time"):
-                    self.stream_start_time = details["actual_start_time"]
-                else:
-                    self.stream_start_time = datetime.now(timezone.utc).isoformat()
+                self.stream_start_time = snippet.get("actualStartTime") or datetime.now(timezone.utc).isoformat()
+                _live_chats[video_id] = {
+                    "live_chat_id": chat_id,
+                    "actual_start_time": self.stream_start_time
+                }
+            else:
+                print("No active live chat found for this broadcast.")
                 
             return chat_id
             
         except HttpError as e:
-            print(f"YouTube Search Error: {e}")
+            print(f"YouTube Broadcast Lookup Error: {e}. Falling back to search.")
+            return self._search_live_chat_id(channel_id)
+        except QuotaExceeded as e:
+            # search.list costs more than the refused call, so it would be refused too
+            print(f"YouTube Broadcast Lookup Error: {e}")
             return None
 
+    def _search_live_chat_id(self, channel_id):
+        """
+        Fallback discovery through search.list (100 units) for when the streamer account is not linked or liveBroadcasts.list failed.
+        Throttled to once per SEARCH_FALLBACK_INTERVAL so an offline channel doesn't drain the daily quota.
+        """
+        global _last_search_fallback
+        if not channel_id:
+            return None
+        now = time.monotonic()
+        if _last_search_fallback is not None and now - _last_search_fallback < SEARCH_FALLBACK_INTERVAL:
+            return None
+        _last_search_fallback = now
+
+        print(f"Searching for a live stream on channel: {channel_id}...")
+        try:
+            request = self.youtube.search().list(
+                part="id",
+                channelId=channel_id,
+                eventType="live",
+                type="video",
+                maxResults=1,
+                fields="items/id/videoId"
+            )
+            response = request.execute()
+            items = response.get("items")
+            if not items:
+                print("No live stream found through search.")
+                return None
+
+            video_id = items[0]["id"]["videoId"]
+            details = self.get_video_details(video_id)
+            chat_id = details.get("live_chat_id") if details else None
+            if chat_id:
+                print(f"Found live stream through search: {video_id}")
+                self._save_cache({"video_id": video_id, "live_chat_id": chat_id})
+                _live_chats[video_id] = details
+                self.live_chat_id = chat_id
+                self.video_id = video_id
+                self.stream_start_time = details.get("actual_start_time") or datetime.now(timezone.utc).isoformat()
+            return chat_id
+
+        except (HttpError, QuotaExceeded) as e:
+            print(f"YouTube Live Search Error: {e}")
+            return None
+
+    def invalidate_live_chat(self):
+        """
+        Forgets the current liveChatId once the API reports the chat is gone (403/404),
+        so the next lookup re-queries liveBroadcasts.list.
+        """
+        if self.video_id:
+            _live_chats.pop(self.video_id, None)
+        self.live_chat_id = None
+        self.video_id = None
+        if os.path.exists(self.CACHE_FILE):
+            try:
+                os.remove(self.CACHE_FILE)
+            except Exception as e:
+                print(f"Failed to clear cache: {e}")
+
     def get_live_chat_id_by_video_id(self, video_id):
         if not self.youtube:
             return None
@@ -149,11 +428,12 @@ class YouTubeClient:
         try:
             request = self.youtube.videos().list(
                 part="liveStreamingDetails",
-                id=video_id
+                id=video_id,
+                fields="items/liveStreamingDetails/activeLiveChatId"
             )
             response = request.execute()
             
-            if response["items"]:
+            if response.get("items"):
                 details = response["items"][0].get("liveStreamingDetails")
                 if details:
                     self.live_chat_id = details.get("activeLiveChatId")
@@ -164,11 +444,16 @@ class YouTubeClient:
             print("No active live chat found for this video.")
             return None
             
-        except HttpError as e:
+        except (HttpError, QuotaExceeded) as e:
             print(f"YouTube API Error: {e}")
             return None
 
-    def send_message(self, message_text, live_chat_id=None):
+    def send_message(self, message_text, live_chat_id=None, deferred=False):
+        """
+        Posts a message to the live chat. A send refused before it was posted (burst limiter,
+        server rate limit, 503 with Retry-After) is retried once after the given delay
+        (deferred=True marks that retry).
+        """
         target_chat_id = live_chat_id or self.live_chat_id
         
         if not self.youtube or not target_chat_id:
@@ -188,16 +473,38 @@ class YouTubeClient:
                     }
                 }
             )
+            # No retries: insert isn't idempotent (a retried 5xx/timeout can double-post), and
+            # googleapiclient's retry sleeps would block the event loop this is called from
             response = request.execute()
             print(f"Message sent: {message_text}")
+            if self.on_message_sent:
+                self.on_message_sent()
             return response
             
+        except QuotaExceeded as e:
+            self._defer_send(message_text, target_chat_id, e.retry_after, deferred, e)
         except HttpError as e:
-            print(f"Failed to send message: {e}")
+            self._defer_send(message_text, target_chat_id, send_retry_delay(e), deferred, e)
+
+    def _defer_send(self, message_text, live_chat_id, delay, deferred, error):
+        """
+        Schedules the one retry of a refused send on the running event loop, without blocking it.
+        Drops the message when there is no safe delay, it was already retried, or no loop is running.
+        """
+        if delay is None or deferred or delay > SEND_RETRY_MAX_DELAY:
+            print(f"Failed to send message: {error}")
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            print(f"Failed to send message: {error}")
+            return
+        print(f"Deferring message by {delay:.1f}s: {error}")
+        loop.call_later(delay, lambda: self.send_message(message_text, live_chat_id, deferred=True))
 
     def get_video_details(self, video_id):
         """
-        Fetches the Title, Channel Name, and actualStartTime of the video/stream.
+        Fetches the Title, Channel Name, actualStartTime and activeLiveChatId of the video/stream.
         """
         if not self.youtube:
             return None
@@ -205,18 +512,20 @@ class YouTubeClient:
         try:
             request = self.youtube.videos().list(
                 part="snippet,liveStreamingDetails",
-                id=video_id
+                id=video_id,
+                fields="items(snippet(title,channelTitle),liveStreamingDetails(actualStartTime,activeLiveChatId))"
             )
             response = request.execute()
             
-            if response["items"]:
+            if response.get("items"):
                 item = response["items"][0]
                 snippet = item.get("snippet", {})
                 live_details = item.get("liveStreamingDetails", {}) or {}
                 return {
                     "title": snippet.get("title"),
                     "channel_title": snippet.get("channelTitle"),
-                    "actual_start_time": live_details.get("actualStartTime")
+                    "actual_start_time": live_details.get("actualStartTime"),
+                    "live_chat_id": live_details.get("activeLiveChatId")
                 }
             return None
         except Exception as e:
@@ -233,11 +542,12 @@ class YouTubeClient:
         try:
             request = self.youtube.videos().list(
                 part="liveStreamingDetails",
-                id=video_id
+                id=video_id,
+                fields="items/liveStreamingDetails/concurrentViewers"
             )
             response = request.execute()
             
-            if response["items"]:
+            if response.get("items"):
                 details = response["items"][0].get("liveStreamingDetails", {})
                 return int(details.get("concurrentViewers", 0))
             return 0
@@ -258,10 +568,11 @@ class YouTubeClient:
         try:
             request = self.youtube.videos().list(
                 part="statistics",
-                id=video_id
+                id=video_id,
+                fields="items/statistics/likeCount"
             )
             response = request.execute()
-            if response["items"]:
+            if response.get("items"):
                 stats = response["items"][0].get("statistics", {})
                 return int(stats.get("likeCount", 0))
             return 0
@@ -269,6 +580,30 @@ class YouTubeClient:
             print(f"Failed to get likes: {e}")
             return 0
 
+    def get_own_channel_id(self):
+        """
+        Returns the channel ID of the authenticated (bot) account, fetched once and cached.
+        """
+        if self.channel_id or not self.youtube:
+            return self.channel_id
+
+        with _discovery_lock:
+            # Another thread may have fetched it while we waited
+            if self.channel_id:
+                return self.channel_id
+            try:
+                request = self.youtube.channels().list(
+                    part="id",
+                    mine=True,
+                    fields="items/id"
+                )
+                response = request.execute()
+                if response.get("items"):
+                    self.channel_id = response["items"][0]["id"]
+            except Exception as e:
+                print(f"Failed to get bot channel ID: {e}")
+        return self.channel_id
+
     def get_channel_subscribers(self, channel_id):
         """
         Fetches the current subscriber count of the channel.
@@ -279,10 +614,11 @@ class YouTubeClient:
         try:
             request = self.youtube.channels().list(
                 part="statistics",
-                id=channel_id
+                id=channel_id,
+                fields="items/statistics/subscriberCount"
             )
             response = request.execute()
-            if response["items"]:
+            if response.get("items"):
                 stats = response["items"][0].get("statistics", {})
                 return int(stats.get("subscriberCount", 0))
             return 0
@@ -290,10 +626,6 @@ class YouTubeClient:
             print(f"Failed to get subscribers: {e}")
             return 0
 
-        except Exception as e:
-            print(f"Failed to get subscribers: {e}")
-            return 0
-
     def get_video_stats(self, video_id):
         """
         Fetches both concurrent viewers and like count in one call.
@@ -305,10 +637,11 @@ class YouTubeClient:
         try:
             request = self.youtube.videos().list(
                 part="liveStreamingDetails,statistics",
-                id=video_id
+                id=video_id,
+                fields="items(liveStreamingDetails/concurrentViewers,statistics/likeCount)"
             )
             response = request.execute()
-            if response["items"]:
+            if response.get("items"):
                 item = response["items"][0]
                 live_details = item.get("liveStreamingDetails", {})
                 stats = item.get("statistics", {})
@@ -321,6 +654,65 @@ class YouTubeClient:
             # print(f"Failed to get video stats: {e}")
             return 0, 0
 
+    def get_stream_stats(self, video_id, channel_id=None):
+        """
+        Fetches concurrent viewers, like count and subscriber count in one batched HTTP round-trip.
+        Returns: (viewers, likes, subs), or None when the lookup could not run so callers keep their last values
+        """
+        if not self.youtube:
+            return 0, 0, 0
+
+        responses = {}
+        def collect(request_id, response, exception):
+            if exception is not None:
+                if isinstance(exception, HttpError):
+                    quota.penalize_rejection(exception)
+                print(f"Failed to get {request_id} stats: {exception}")
+                return
+            responses[request_id] = response
+
+        # Batched sub-requests bypass QuotaHttpRequest.execute(), so charge them here, all before
+        # building the batch so a refusal never leaves units spent on a request that isn't sent
+        endpoints = ["videos.list", "channels.list"] if channel_id else ["videos.list"]
+        charged = []
+        try:
+            for endpoint in endpoints:
+                quota.charge(endpoint)
+                charged.append(endpoint)
+        except QuotaExceeded as e:
+            for endpoint in charged:
+                quota.refund(endpoint)
+            print(f"Skipping stream stats: {e}")
+            return None
+
+        try:
+            batch = self.youtube.new_batch_http_request(callback=collect)
+            batch.add(self.youtube.videos().list(
+                part="liveStreamingDetails,statistics",
+                id=video_id,
+                fields="items(liveStreamingDetails/concurrentViewers,statistics/likeCount)"
+            ), request_id="video")
+            if channel_id:
+                batch.add(self.youtube.channels().list(
+                    part="statistics",
+                    id=channel_id,
+                    fields="items/statistics/subscriberCount"
+                ), request_id="channel")
+            batch.execute()
+        except Exception as e:
+            print(f"Failed to get stream stats: {e}")
+            return None
+
+        viewers = likes = subs = 0
+        video_items = responses.get("video", {}).get("items")
+        if video_items:
+            viewers = int(video_items[0].get("liveStreamingDetails", {}).get("concurrentViewers", 0))
+            likes = int(video_items[0].get("statistics", {}).get("likeCount", 0))
+        channel_items = responses.get("channel", {}).get("items")
+        if channel_items:
+            subs = int(channel_items[0].get("statistics", {}).get("subscriberCount", 0))
+        return viewers, likes, subs
+
     def delete_message(self, message_id):
         """
         Deletes (hides) a message from the live chat.
@@ -328,9 +720,10 @@ class YouTubeClient:
         if not self.youtube:
             return
         try:
-            self.youtube.liveChatMessages().delete(id=message_id).execute()
+            request = self.youtube.liveChatMessages().delete(id=message_id)
+            request.execute()
             print(f"Deleted message: {message_id}")
-        except HttpError as e:
+        except (HttpError, QuotaExceeded) as e:
             print(f"Failed to delete message: {e}")
 
     def timeout_user(self, user_channel_id, duration_seconds=300, live_chat_id=None):
@@ -342,7 +735,7 @@ class YouTubeClient:
             return
 
         try:
-            self.youtube.liveChatBans().insert(
+            request = self.youtube.liveChatBans().insert(
                 part="snippet",
                 body={
                     "snippet": {
@@ -354,9 +747,10 @@ class YouTubeClient:
                         }
                     }
                 }
-            ).execute()
+            )
+            request.execute()
             print(f"Timed out user {user_channel_id} for {duration_seconds}s")
-        except HttpError as e:
+        except (HttpError, QuotaExceeded) as e:
             print(f"Failed to timeout user: {e}")
 
     def get_latest_videos(self, channel_id, max_results=5):
@@ -372,7 +766,8 @@ class YouTubeClient:
                 channelId=channel_id,
                 order="date",
                 type="video",
-                maxResults=max_results
+                maxResults=max_results,
+                fields="items(id/videoId,snippet(title,publishedAt))"
             )
             response = request.execute()
             videos = []
@@ -400,7 +795,8 @@ class YouTubeClient:
                 channelId=channel_id,
                 eventType="upcoming",
                 type="video",
-                maxResults=max_results
+                maxResults=max_results,
+                fields="items(id/videoId,snippet(title,publishedAt))"
             )
             response = request.execute()
             streams = []
@@ -418,13 +814,14 @@ class YouTubeClient:
     def get_streamer_client(self):
         """
         Authenticates and returns a YouTube service object using the Streamer credentials.
+        Like `youtube`, the service is private to the calling thread, since rediscovery and
+        subscriber checks call this from executor threads.
         """
         token_path = settings.YOUTUBE_STREAMER_TOKEN_PATH
         if not os.path.exists(token_path):
             return None
         try:
-            creds = Credentials.from_authorized_user_file(token_path)
-            return build("youtube", "v3", credentials=creds)
+            return yt_service.get_youtube(token_path, slot=yt_service.thread_slot())
         except Exception as e:
             print(f"YouTube Streamer Auth Error: {e}")
             return None
@@ -441,7 +838,8 @@ class YouTubeClient:
             request = streamer_client.subscriptions().list(
                 part="subscriberSnippet",
                 mySubscribers=True,
-                maxResults=max_results
+                maxResults=max_results,
+                fields="items/subscriberSnippet(channelId,title)"
             )
             response = request.execute()
             subscribers = []
@@ -458,6 +856,7 @@ class YouTubeClient:
             # remove the streamer token so the user can re-authenticate from the frontend.
             if "invalid_grant" in str(e):
                 token_path = settings.YOUTUBE_STREAMER_TOKEN_PATH
+                yt_service.reset(token_path)
                 if os.path.exists(token_path):
                     try:
                         os.remove(token_path)
@@ -1,18 +1,63 @@
 import asyncio
+import atexit
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
 from googleapiclient.errors import HttpError
 
 from collections import deque
+from app.settings import settings
+from app.youtube_client import classify_http_error, http_error_reason, retry_after_seconds
+from app.quota import QuotaExceeded
+
+# Shared read-only default for missing sub-objects, so parsing a message doesn't allocate empty dicts
+_EMPTY = {}
+
+logger = logging.getLogger("axibot.youtube")
+_log_listener = None
+
+class _DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare() formats the record (and its traceback) in the caller's thread.
+    # Records stay in-process, so hand them over as-is and let the listener thread do that work
+    def prepare(self, record):
+        return record
+
+def _setup_logging():
+    """
+    Sends listener error reports through a queue, so traceback formatting and console writes
+    happen on a background thread instead of stalling the polling loop.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    # Bound to the current stdout, which the GUI has already swapped for its log capture
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
 class YouTubeChatListener:
-    def __init__(self, youtube_client, callback):
+    def __init__(self, youtube_client, callback, batch_callback=None):
+        _setup_logging()
         self.youtube_client = youtube_client
         self.callback = callback
+        # Optional plain function called once per poll with the list of new messages,
+        # for cheap per-page work (counters, bulk inserts) that doesn't need a task per message
+        self.batch_callback = batch_callback
         self.is_running = False
         self.next_page_token = None
         
-        # Dedicated client for the background polling thread to fix SSL socket thread-safety issues
-        orig_client = self.youtube_client.get_new_client()
-        self.polling_client = orig_client if orig_client else self.youtube_client.youtube
+        # Message handlers run as tasks so LLM replies don't stall polling
+        self.MAX_CONCURRENT_HANDLERS = 4
+        self.handler_slots = asyncio.Semaphore(self.MAX_CONCURRENT_HANDLERS)
+        self.handler_tasks = set()
         
         # Deduplication
         self.processed_ids = deque(maxlen=200)
@@ -21,8 +66,20 @@ class YouTubeChatListener:
         self.min_poll_interval = 3   # Active chat (3s = ~8.3 hours runtime)
         self.max_poll_interval = 8   # Idle chat
         self.current_poll_interval = self.min_poll_interval
-        self.idle_loops = 0
-        self.IDLE_THRESHOLD = 3      # Loops without messages before slowing down
+        self.server_poll_interval = 0 # pollingIntervalMillis from the last response, in seconds
+        self.error_poll_interval = 60 # Longest backoff after an API error when the server gives no Retry-After
+        self.error_backoff = self.min_poll_interval # Last error backoff, grows with consecutive errors
+        self.token_refreshed = False # Set after a 401 forced a token refresh, cleared by the next good poll
+        self.ACTIVE_DECREASE_FACTOR = 0.7 # Interval multiplier after a poll with new messages
+        self.IDLE_INCREASE_FACTOR = 1.5   # Interval multiplier per empty poll once chat has gone idle
+        self.IDLE_THRESHOLD = 30          # Seconds without messages before slowing down
+        self.last_message_at = None       # Event loop time of the last new message
+        
+        # Set when the bot posts to chat, so the next poll comes early and picks up replies to it
+        self.wake = asyncio.Event()
+        self.loop = None
+        self.last_poll_ok = False # Only a healthy poller may cut its sleep short, never an error backoff
+        youtube_client.on_message_sent = self.wake_soon
         
         # Subscriber Polling Cache
         self.seen_subscribers = None
@@ -35,7 +92,13 @@ class YouTubeChatListener:
         """
         print("Starting YouTube Chat Listener (Native Polling)...")
         self.is_running = True
+        self.loop = asyncio.get_running_loop()
         
+        # Checked once here rather than on every poll, the client doesn't lose its service while running
+        if not self.youtube_client.youtube:
+            print("YouTube client is not authenticated. Listener cannot start.")
+            return
+
         # Ensure we have a valid chat ID
         if not self.youtube_client.live_chat_id:
             print("No Live Chat ID found. Listener cannot start.")
@@ -43,60 +106,94 @@ class YouTubeChatListener:
 
         print(f"Listening to Chat ID: {self.youtube_client.live_chat_id}")
 
-        while self.is_running:
-            try:
-                # Poll for messages
-                await self._poll_messages()
-                
-                # Check for new subscribers within the same loop (every 60s)
-                loop = asyncio.get_running_loop()
-                now = loop.time()
-                if now - self.last_subscriber_check >= self.subscriber_check_interval:
-                    self.last_subscriber_check = now
-                    await self._check_subscribers()
-                
-                # Sleep for the current interval
-                await asyncio.sleep(self.current_poll_interval)
-                
-            except asyncio.CancelledError:
-                print("YouTube Listener stopping...")
-                self.is_running = False
-            except Exception as e:
-                print(f"Polling Loop Error: {e}")
-                await asyncio.sleep(10) # Safety backoff
+        # Resume after a quick restart instead of discarding (or replaying) the latest page
+        self.next_page_token = self.youtube_client.load_page_token()
+        if self.next_page_token:
+            print("Resuming chat from the saved page token.")
+
+        try:
+            while self.is_running:
+                try:
+                    # Poll for messages
+                    await self._poll_messages()
+                    
+                    # Check for new subscribers within the same loop (every 60s)
+                    loop = asyncio.get_running_loop()
+                    now = loop.time()
+                    if now - self.last_subscriber_check >= self.subscriber_check_interval:
+                        self.last_subscriber_check = now
+                        await self._check_subscribers()
+                    
+                    await self._wait_next_poll()
+                    
+                except asyncio.CancelledError:
+                    print("YouTube Listener stopping...")
+                    self.is_running = False
+                    for task in list(self.handler_tasks):
+                        task.cancel()
+                except Exception as e:
+                    logger.exception("Polling Loop Error: %s", e)
+                    await asyncio.sleep(10) # Safety backoff
+        finally:
+            # Release the polling connections so shutdown doesn't leave sockets open
+            await self.youtube_client.aclose()
+
+    def wake_soon(self):
+        """
+        Asks the polling loop to poll early. Safe to call from any thread.
+        """
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.wake.set)
+
+    async def _wait_next_poll(self):
+        """
+        Sleeps for the current interval, never polling faster than YouTube asks.
+        A wake() after the bot speaks cuts the adaptive part of the wait short.
+        """
+        self.wake.clear()
+        timeout = max(self.current_poll_interval, self.server_poll_interval)
+        if not self.last_poll_ok:
+            await asyncio.sleep(timeout)
+            return
+
+        started = self.loop.time()
+        try:
+            await asyncio.wait_for(self.wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return
+        remaining = self.server_poll_interval - (self.loop.time() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
 
     async def _poll_messages(self):
-        if not self.youtube_client.youtube:
+        if not self.youtube_client.live_chat_id:
+            await self._rediscover_chat()
             return
 
+        self.last_poll_ok = False
         try:
-            # We must run the blocking API call in a thread to avoid blocking the event loop
-            loop = asyncio.get_running_loop()
-            
-            # Prepare request arguments
-            kwargs = {
-                "liveChatId": self.youtube_client.live_chat_id,
-                "part": "snippet,authorDetails"
-            }
-            if self.next_page_token:
-                kwargs["pageToken"] = self.next_page_token
-
-            # Execute API call in thread
-            # Use the dedicated polling client to maintain thread safety
-            response = await loop.run_in_executor(
-                None, 
-                lambda: self.polling_client.liveChatMessages().list(**kwargs).execute()
+            # Async HTTP request, the event loop keeps serving handlers while we wait
+            page_token = self.next_page_token
+            response = await self.youtube_client.list_chat_messages(
+                self.youtube_client.live_chat_id,
+                page_token=page_token
             )
 
             # If this is the very first poll, we want to discard these historical items 
             # so the bot doesn't spam replies to old chats upon starting.
-            is_first_request = (kwargs.get("pageToken") is None)
+            is_first_request = (page_token is None)
+
+            self.error_backoff = self.min_poll_interval
+            self.token_refreshed = False
+            self.last_poll_ok = True
 
-            # Update pagination
+            # Update pagination, the next poll only returns messages after this token
             self.next_page_token = response.get("nextPageToken")
+            self.server_poll_interval = response.get("pollingIntervalMillis", 0) / 1000
             
             items = response.get("items", [])
-            new_messages_count = 0
+            self._maybe_save_page_token(items)
+            new_messages = []
             
             if items:
                 for item in items:
@@ -109,56 +206,155 @@ class YouTubeChatListener:
                             
                             # Ignore processing old messages on first boot
                             if not is_first_request:
-                                new_messages_count += 1
+                                new_messages.append(message_data)
                                 if self.callback:
-                                    await self.callback(message_data)
+                                    self._dispatch(message_data)
+
+            if new_messages and self.batch_callback:
+                try:
+                    self.batch_callback(new_messages)
+                except Exception as e:
+                    logger.exception("Message Batch Handler Error: %s", e)
+            new_messages_count = len(new_messages)
             
-            # Adaptive Logic
+            # Adaptive Logic: multiplicative decrease on activity, multiplicative increase when idle
+            now = asyncio.get_running_loop().time()
+            interval = min(max(self.current_poll_interval, self.min_poll_interval), self.max_poll_interval)
             if new_messages_count > 0:
-                self.current_poll_interval = self.min_poll_interval
-                self.idle_loops = 0
+                self.last_message_at = now
+                self.current_poll_interval = max(self.min_poll_interval, interval * self.ACTIVE_DECREASE_FACTOR)
                 # print(f"Active chat! Polling every {self.current_poll_interval}s")
             else:
-                self.idle_loops += 1
-                if self.idle_loops >= self.IDLE_THRESHOLD:
-                    self.current_poll_interval = min(self.current_poll_interval + 5, self.max_poll_interval)
+                if self.last_message_at is None:
+                    self.last_message_at = now
+                if now - self.last_message_at > self.IDLE_THRESHOLD:
+                    self.current_poll_interval = min(self.max_poll_interval, interval * self.IDLE_INCREASE_FACTOR)
                     # print(f"Chat idle. Slowing poll to {self.current_poll_interval}s")
+                else:
+                    self.current_poll_interval = interval
 
+        except QuotaExceeded as e:
+            print(f"{e}. Slowing down chat polling.")
+            if e.retry_after is not None:
+                self.current_poll_interval = max(self.min_poll_interval, e.retry_after)
+            else:
+                self.current_poll_interval = 60
         except HttpError as e:
+            action = classify_http_error(e)
+            if action == "gone":
+                print(f"Live chat is no longer available ({http_error_reason(e) or e.resp.status}). Forgetting cached chat ID.")
+                self.youtube_client.invalidate_live_chat()
+                self.next_page_token = None
+                await self._rediscover_chat()
+                return
+            if action == "refresh" and not self.token_refreshed:
+                print("YouTube rejected the access token. Refreshing it and retrying.")
+                self.token_refreshed = True
+                try:
+                    await self.youtube_client.refresh_access_token()
+                    self.current_poll_interval = self.min_poll_interval
+                except Exception as re:
+                    print(f"YouTube token refresh failed: {re}. Please run auth_helper.py again.")
+                    self.is_running = False
+                return
+            if action == "fatal" and e.resp.status == 400 and self.next_page_token:
+                # A resumed page token can be rejected, start again from the latest page
+                print(f"YouTube rejected the chat page token ({http_error_reason(e)}). Starting from the latest page.")
+                self.next_page_token = None
+                return
+            if action in ("fatal", "refresh"):
+                # Retrying can't fix these, stop instead of burning quota on a dead request
+                print(f"YouTube Polling API Error (not retrying, stopping listener): {e}")
+                self.is_running = False
+                return
             print(f"YouTube Polling API Error: {e}")
-            # If 403/QuotaExceeded, we should probably stop or sleep long
-            self.current_poll_interval = 60 # Sleep longer on error
+            # Prefer the server's own Retry-After over our blind backoff
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                self.current_poll_interval = min(max(retry_after, self.min_poll_interval), self.error_poll_interval)
+            else:
+                self._backoff()
         except Exception as e:
-            print(f"Unexpected Polling Error: {e}")
-            self.current_poll_interval = 30 # Safety backoff
+            logger.exception("Unexpected Polling Error: %s", e)
+            self._backoff()
+
+    def _backoff(self):
+        """
+        Decorrelated jitter: the next wait is random between the minimum and 3x the previous one,
+        so restarted or sibling bots don't retry against the shared quota in lockstep.
+        """
+        self.error_backoff = min(
+            self.error_poll_interval,
+            random.uniform(self.min_poll_interval, self.error_backoff * 3)
+        )
+        self.current_poll_interval = self.error_backoff
+
+    def _maybe_save_page_token(self, items):
+        """
+        Persists the page token after every poll that returned messages, so a restart never
+        replays (and re-answers) a message that was already handled. Empty polls skip the write:
+        resuming from the older token returns nothing new either.
+        """
+        if items and self.next_page_token:
+            self.youtube_client.save_page_token(self.next_page_token)
+
+    def _dispatch(self, message_data):
+        """
+        Runs the callback for one message as a background task.
+        """
+        task = asyncio.create_task(self._run_callback(message_data))
+        self.handler_tasks.add(task)
+        task.add_done_callback(self.handler_tasks.discard)
+
+    async def _run_callback(self, message_data):
+        # Bound the number of messages being handled (and LLM calls in flight) at once
+        async with self.handler_slots:
+            try:
+                await self.callback(message_data)
+            except Exception as e:
+                logger.exception("Message Handler Error: %s", e)
+
+    async def _rediscover_chat(self):
+        """
+        Looks up the active broadcast again after the previous live chat ended.
+        """
+        loop = asyncio.get_running_loop()
+        chat_id = await loop.run_in_executor(
+            None,
+            self.youtube_client.get_live_chat_id_for_channel,
+            settings.STREAMER_CHANNEL_ID
+        )
+        if chat_id:
+            print(f"Listening to Chat ID: {chat_id}")
+            self.current_poll_interval = self.min_poll_interval
+        else:
+            self.current_poll_interval = 60 # No live stream yet, check again later
 
     def _parse_item(self, item):
         """
         Converts a YouTube API item into our standard internal message format.
         """
-        snippet = item.get("snippet", {})
+        snippet = item.get("snippet", _EMPTY)
         msg_type = snippet.get("type")
-        
-        user_name = item.get("authorDetails", {}).get("displayName", "Unknown")
-        user_id = item.get("authorDetails", {}).get("channelId")
+        author = item.get("authorDetails", _EMPTY)
         
         base_data = {
             "id": item.get("id"),
             "platform": "youtube",
             "type": "chat",
-            "user": user_name,
-            "user_id": user_id,
+            "user": author.get("displayName", "Unknown"),
+            "user_id": author.get("channelId"),
             "message": "",
             "timestamp": snippet.get("publishedAt"),
             "raw_type": msg_type
         }
 
         if msg_type == "textMessageEvent":
-            base_data["message"] = snippet.get("textMessageDetails", {}).get("messageText", "")
+            base_data["message"] = snippet.get("textMessageDetails", _EMPTY).get("messageText", "")
             return base_data
             
         elif msg_type == "superChatEvent":
-            details = snippet.get("superChatDetails", {})
+            details = snippet.get("superChatDetails", _EMPTY)
             amount = details.get("amountDisplayString", "")
             msg = details.get("userComment", "")
             base_data["type"] = "superChat"
@@ -167,7 +363,7 @@ class YouTubeChatListener:
             return base_data
             
         elif msg_type == "superStickerEvent":
-            details = snippet.get("superStickerDetails", {})
+            details = snippet.get("superStickerDetails", _EMPTY)
             amount = details.get("amountDisplayString", "")
             base_data["type"] = "superSticker"
             base_data["amount"] = amount
@@ -178,7 +374,7 @@ class YouTubeChatListener:
             return base_data
             
         elif msg_type == "memberMilestoneChatEvent":
-            details = snippet.get("memberMilestoneChatDetails", {})
+            details = snippet.get("memberMilestoneChatDetails", _EMPTY)
             msg = details.get("userComment", "")
             level = details.get("memberLevelName", "")
             base_data["type"] = "memberMilestone"
@@ -219,6 +415,6 @@ class YouTubeChatListener:
                     }
                     print(f"[Subscriber Poller] New native subscriber detected: {sub['name']}!")
                     if self.callback:
-                        await self.callback(event_data)
+                        self._dispatch(event_data)
         except Exception as e:
             print(f"[Subscriber Poller] Check failed: {e}")
@@ -0,0 +1,105 @@
+import threading
+import httplib2
+import orjson
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.model import JsonModel
+from app.quota import QuotaHttpRequest
+
+# Built YouTube services keyed by (token_path, slot)
+_services = {}
+# Credentials keyed by token_path, shared by every service and raw HTTP call
+_credentials = {}
+# Underlying httplib2 transports keyed by (token_path, slot). They outlive reset() so a
+# rebuilt service (new token, reconnect) keeps the already-open TLS connection
+_transports = {}
+HTTP_TIMEOUT = 30 # seconds, so a stalled socket can't hang an API call forever
+# Parsed YouTube v3 discovery document, read from the copy bundled with googleapiclient once per process
+_discovery_doc = None
+_lock = threading.Lock()
+
+def get_credentials(token_path):
+    """
+    Returns the Credentials for a token file, reading and parsing it once per process.
+    Credentials refresh themselves, so one instance serves every client using that token.
+    """
+    with _lock:
+        return _get_credentials_locked(token_path)
+
+def _get_credentials_locked(token_path):
+    creds = _credentials.get(token_path)
+    if creds is None:
+        with open(token_path, "rb") as f:
+            info = orjson.loads(f.read())
+        creds = Credentials.from_authorized_user_info(info)
+        _credentials[token_path] = creds
+    return creds
+
+class OrjsonModel(JsonModel):
+    """
+    JsonModel that parses API responses with orjson instead of the stdlib json module.
+    """
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Same fallback as JsonModel: hand back non-JSON bodies as text
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+def _get_discovery_doc_locked():
+    global _discovery_doc
+    if _discovery_doc is None:
+        _discovery_doc = orjson.loads(get_static_doc("youtube", "v3"))
+    return _discovery_doc
+
+def thread_slot():
+    """
+    Returns a service slot private to the calling thread, for code that runs on the event loop
+    and in executor threads at the same time.
+    """
+    return f"thread-{threading.get_ident()}"
+
+def get_youtube(token_path, slot="main"):
+    """
+    Returns a YouTube service for the given token file, building it once per process.
+    The service keeps its AuthorizedHttp alive so TLS connections and token refreshes are reused.
+    httplib2 is not thread-safe, so code running on another thread should ask for its own `slot`
+    (see thread_slot()).
+    """
+    key = (token_path, slot)
+    with _lock:
+        youtube = _services.get(key)
+        if youtube is None:
+            creds = _get_credentials_locked(token_path)
+            transport = _transports.get(key)
+            if transport is None:
+                transport = httplib2.Http(timeout=HTTP_TIMEOUT)
+                _transports[key] = transport
+            http = AuthorizedHttp(creds, http=transport)
+            # Reuse the parsed discovery doc instead of loading the ~400 KB JSON on every build
+            youtube = build_from_document(
+                _get_discovery_doc_locked(),
+                http=http,
+                model=OrjsonModel(),
+                requestBuilder=QuotaHttpRequest
+            )
+            _services[key] = youtube
+        return youtube
+
+def reset(token_path=None):
+    """
+    Drops cached services and credentials (all, or only those for `token_path`)
+    after a token is replaced or removed. Transports are kept for the next build.
+    """
+    with _lock:
+        for key in list(_services):
+            if token_path is None or key[0] == token_path:
+                del _services[key]
+        for key in list(_credentials):
+            if token_path is None or key == token_path:
+                del _credentials[key]
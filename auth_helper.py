@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -10,6 +10,28 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtube.force-ssl"
 ]
 
+def save_token(token_path, token_json):
+    """
+    Writes the token atomically (temp file, fsync, rename) so a crash mid-write can't leave
+    an empty token behind. Skips the write when the file already holds the same token.
+    """
+    data = token_json.encode("utf-8")
+    if os.path.exists(token_path):
+        with open(token_path, "rb") as f:
+            if f.read() == data:
+                return False
+
+    directory = os.path.dirname(token_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = token_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, token_path)
+    return True
+
 def authenticate_youtube(token_path=None):
     # Load settings from .env manually or via python-dotenv if available
     from dotenv import load_dotenv
@@ -31,7 +53,8 @@ def authenticate_youtube(token_path=None):
     # created automatically when the authorization flow completes for the first
     # time.
     if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+        with open(token_path, "rb") as f:
+            creds = Credentials.from_authorized_user_info(orjson.loads(f.read()), SCOPES)
     
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
@@ -44,9 +67,7 @@ def authenticate_youtube(token_path=None):
             creds = flow.run_local_server(port=0)
         
         # Save the credentials for the next run
-        os.makedirs(os.path.dirname(token_path), exist_ok=True)
-        with open(token_path, "w") as token:
-            token.write(creds.to_json())
+        if save_token(token_path, creds.to_json()):
             print(f"Token saved to {token_path}")
 
     print("Authentication successful!")
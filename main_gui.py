@@ -29,6 +29,9 @@ class LogCapture:
     def __init__(self, max_logs=400):
         self.logs = []
         self.max_logs = max_logs
+        # print() on the event loop, the listener's QueueListener thread and executor threads
+        # all write here, and pywebview reads from its own thread
+        self._lock = threading.Lock()
         self.original_stdout = sys.stdout
         self.original_stderr = sys.stderr
 
@@ -36,9 +39,10 @@ class LogCapture:
         if message.strip():
             timestamp = datetime.now().strftime("%H:%M:%S")
             log_entry = f"[{timestamp}] {message.strip()}"
-            self.logs.append(log_entry)
-            if len(self.logs) > self.max_logs:
-                self.logs.pop(0)
+            with self._lock:
+                self.logs.append(log_entry)
+                if len(self.logs) > self.max_logs:
+                    self.logs.pop(0)
         try:
             self.original_stdout.write(message)
         except Exception:
@@ -54,7 +58,8 @@ class LogCapture:
         self.original_stdout.flush()
 
     def get_logs(self):
-        return self.logs
+        with self._lock:
+            return list(self.logs)
 
 log_capture = LogCapture()
 sys.stdout = log_capture
@@ -134,11 +139,12 @@ class WebAPI:
             
         # 2. If not cached, fetch from YouTube API
         try:
-            from google.oauth2.credentials import Credentials
-            from googleapiclient.discovery import build
-            creds = Credentials.from_authorized_user_file(token_path)
-            youtube = build("youtube", "v3", credentials=creds)
-            response = youtube.channels().list(part="id,snippet", mine=True).execute()
+            from app import yt_service
+            youtube = yt_service.get_youtube(token_path, slot="gui")
+            response = youtube.channels().list(
+                part="id,snippet", mine=True,
+                fields="items(id,snippet(title,thumbnails/default/url))"
+            ).execute()
             if response.get("items"):
                 channel_data = response["items"][0]
                 channel_id = channel_data["id"]
@@ -154,10 +160,6 @@ class WebAPI:
                 return settings.STREAMER_CHANNEL_NAME
         return ""
 
-    def check_auth_status(self):
-        """ Returns True if the YouTube Streamer OAuth token exists (compatibility check) """
-        return self.check_streamer_auth_status()
-
     def get_bot_status(self):
         """ Returns current run status and statistics """
         return {
@@ -181,14 +183,17 @@ class WebAPI:
                 
                 # Automatically retrieve the Channel ID for the authenticated user
                 try:
-                    from google.oauth2.credentials import Credentials
-                    from googleapiclient.discovery import build
+                    from app import yt_service
                     
                     if os.path.exists(token_path):
-                        creds = Credentials.from_authorized_user_file(token_path)
-                        youtube = build("youtube", "v3", credentials=creds)
+                        # A new token was just written, drop services built from the old one
+                        yt_service.reset(token_path)
+                        youtube = yt_service.get_youtube(token_path, slot="gui")
                         
-                        response = youtube.channels().list(part="id,snippet", mine=True).execute()
+                        response = youtube.channels().list(
+                            part="id,snippet", mine=True,
+                            fields="items(id,snippet(title,thumbnails/default/url))"
+                        ).execute()
                         if response.get("items"):
                             channel_data = response["items"][0]
                             channel_id = channel_data["id"]
@@ -222,6 +227,8 @@ class WebAPI:
             return False
         token_path = settings.YOUTUBE_STREAMER_TOKEN_PATH
         if os.path.exists(token_path):
+            from app import yt_service
+            yt_service.reset(token_path)
             os.remove(token_path)
             # Remove local channel cache on disconnect
             cache_path = "storage/channel_cache.json"
@@ -484,17 +491,18 @@ class WebAPI:
                 
                 # Fetch initial stats
                 if youtube.video_id:
-                    viewers, likes = youtube.get_video_stats(youtube.video_id)
-                    self.stats["viewers"] = viewers
-                    self.stats["likes"] = likes
+                    # Video and channel stats share one batched round-trip
+                    stats = youtube.get_stream_stats(youtube.video_id, settings.STREAMER_CHANNEL_ID)
+                    if stats is not None:
+                        self.stats["viewers"], self.stats["likes"], self.stats["subs"] = stats
                     
                     details = youtube.get_video_details(youtube.video_id)
                     if details:
                         print(f"Stream Context Loaded: {details.get('title')}")
                         if hasattr(gemini, 'stream_context'):
                             gemini.stream_context = details
-                
-                self.stats["subs"] = youtube.get_channel_subscribers(settings.STREAMER_CHANNEL_ID)
+                else:
+                    self.stats["subs"] = youtube.get_channel_subscribers(settings.STREAMER_CHANNEL_ID)
 
                 # Channel brain
                 latest_videos = youtube.get_latest_videos(settings.STREAMER_CHANNEL_ID)
@@ -527,18 +535,14 @@ class WebAPI:
 
             router = MessageRouter(gemini_client=gemini, youtube_client=youtube, tts_callback=play_tts_callback)
             
-            # Setup route counting
-            orig_route = router.route_message
-            async def wrapped_route(message_data):
-                if message_data and message_data.get('type') == 'chat':
-                    self.stats["messages_processed"] += 1
-                await orig_route(message_data)
-            router.route_message = wrapped_route
-
             async def on_event(event_data):
                 await router.route_message(event_data)
 
-            yt_listener = YouTubeChatListener(youtube_client=youtube, callback=on_event)
+            # Count chat messages once per polled page instead of wrapping every route call
+            def count_messages(messages):
+                self.stats["messages_processed"] += sum(1 for m in messages if m["type"] == "chat")
+
+            yt_listener = YouTubeChatListener(youtube_client=youtube, callback=on_event, batch_callback=count_messages)
             engagement = EngagementManager(llm_client=gemini)
             self.engagement_manager = engagement
 
@@ -547,13 +551,13 @@ class WebAPI:
                 while self.running:
                     try:
                         if youtube.video_id:
-                            viewers, likes = youtube.get_video_stats(youtube.video_id)
-                            self.stats["viewers"] = viewers
-                            self.stats["likes"] = likes
-                            
                             channel_id = settings.STREAMER_CHANNEL_ID
-                            subs = youtube.get_channel_subscribers(channel_id) if channel_id else 0
-                            self.stats["subs"] = subs
+                            # Video and channel stats share one batched round-trip
+                            stats = youtube.get_stream_stats(youtube.video_id, channel_id)
+                            # A refused or failed lookup keeps the last known values on the dashboard
+                            if stats is not None:
+                                self.stats["viewers"], self.stats["likes"], self.stats["subs"] = stats
+                            viewers, likes, subs = self.stats["viewers"], self.stats["likes"], self.stats["subs"]
 
                             # Check targets
                             target_msg = await engagement.check_targets(likes, subs)
@@ -1121,7 +1125,8 @@ if __name__ == "__main__":
     print("Initializing AxiBot GUI application...")
     
     # Start background thread for Asyncio operations
-    loop = asyncio.new_event_loop()
+    from app.main import new_event_loop
+    loop = new_event_loop()
     t = threading.Thread(target=start_asyncio_thread, args=(loop,), daemon=True)
     t.start()
     
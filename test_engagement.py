@@ -19,7 +19,7 @@ def test_engagement_manager():
         
     print("\n--- Test 2: Rate Limiting ---")
     manager.min_interval = 2 # 2 seconds for test
-    manager.last_message_time = time.time()
+    manager.last_message_time = time.monotonic()
     
     msg = manager.get_next_message()
     if msg is None:
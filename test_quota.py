@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httplib2
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from app import quota
+from app.quota import TokenBucket, COST_TABLE, QuotaHttpRequest, QuotaExceeded
+
+def test_token_bucket():
+    print("=== Testing Quota Token Bucket ===")
+    bucket = TokenBucket(capacity=10000, rate=10000 / 86400)
+
+    # A full bucket allows exactly 100 search.list calls
+    allowed = 0
+    while bucket.allow(COST_TABLE["search.list"]):
+        allowed += 1
+    print(f"search.list calls allowed from a full bucket: {allowed}")
+    assert allowed == 100
+
+    # An empty bucket rejects without going negative
+    assert not bucket.allow(COST_TABLE["videos.list"])
+    assert bucket.tokens >= 0
+
+    # Refill is proportional to elapsed time and capped at capacity
+    bucket.last -= 3600
+    assert bucket.allow(COST_TABLE["liveChatMessages.list"])
+    print(f"Tokens after one simulated hour: {bucket.tokens:.1f}")
+    assert 410 < bucket.tokens < 420
+
+    bucket.last -= 86400 * 2
+    bucket.penalize(0)
+    assert bucket.tokens == bucket.capacity
+
+    # Penalties never push the balance below zero
+    bucket.penalize(bucket.capacity * 2)
+    assert bucket.tokens == 0
+    print("Success: Token bucket behaves as expected.")
+
+def test_burst_limit():
+    print("=== Testing Quota Burst Limit ===")
+    saved_bucket, saved_burst = quota.bucket, quota.burst
+    quota.bucket = TokenBucket(capacity=10000, rate=0)
+    quota.burst = TokenBucket(capacity=150, rate=0)
+    try:
+        # Three 50-unit inserts fit the burst, the fourth is refused without touching the daily budget
+        for _ in range(3):
+            quota.charge("liveChatMessages.insert")
+        try:
+            quota.charge("liveChatMessages.insert")
+            assert False, "fourth insert should have been refused"
+        except QuotaExceeded as e:
+            print(f"Refused as expected: {e}")
+        assert quota.bucket.tokens == 10000 - 150
+
+        # The retry hint covers only the current deficit, not the whole cost
+        quota.burst = TokenBucket(capacity=150, rate=5)
+        quota.burst.tokens = 30
+        quota.burst.last = time.monotonic()
+        try:
+            quota.charge("liveChatMessages.insert")
+            assert False, "insert should have been refused"
+        except QuotaExceeded as e:
+            print(f"Retry hint: {e.retry_after:.2f}s")
+            assert 3.9 < e.retry_after <= 4.0
+
+        # A call refused by the daily budget gives its burst tokens back
+        quota.burst = TokenBucket(capacity=150, rate=0)
+        quota.bucket = TokenBucket(capacity=10, rate=0)
+        try:
+            quota.charge("search.list")
+            assert False, "search.list should have been refused"
+        except QuotaExceeded:
+            pass
+        assert quota.burst.tokens == 150
+    finally:
+        quota.bucket, quota.burst = saved_bucket, saved_burst
+    print("Success: Burst limiter behaves as expected.")
+
+def test_request_builder_gate():
+    print("=== Testing Quota Request Builder ===")
+    yt = build("youtube", "v3", developerKey="test", cache_discovery=False, requestBuilder=QuotaHttpRequest)
+
+    # Every resource instance produces gated requests, not just the one that was patched
+    request = yt.search().list(part="id", q="test")
+    assert isinstance(request, QuotaHttpRequest)
+    assert isinstance(yt.videos().list(part="id", id="x"), QuotaHttpRequest)
+
+    # With the shared bucket drained, execute() refuses before touching the network
+    saved = quota.bucket
+    quota.bucket = TokenBucket(capacity=COST_TABLE["search.list"] - 1, rate=0)
+    try:
+        request.execute()
+        assert False, "search.list should have been refused"
+    except QuotaExceeded as e:
+        print(f"Refused as expected: {e}")
+    finally:
+        quota.bucket = saved
+    print("Success: Requests are charged through one patch site.")
+
+def test_rejection_penalty():
+    print("=== Testing Quota Rejection Penalty ===")
+    def error(status, reason):
+        resp = httplib2.Response({})
+        resp.status = status
+        content = b'{"error": {"errors": [{"reason": "%s"}]}}' % reason.encode()
+        return HttpError(resp, content)
+
+    saved = quota.bucket
+    quota.bucket = TokenBucket(capacity=1000, rate=0)
+    try:
+        # Permission and chat-state 403s don't burn quota
+        for reason in ("liveChatEnded", "forbidden", "insufficientPermissions"):
+            quota.penalize_rejection(error(403, reason))
+        assert quota.bucket.tokens == 1000
+
+        # Rate limits do, whether signalled by status or by reason
+        quota.penalize_rejection(error(429, "rateLimitExceeded"))
+        quota.penalize_rejection(error(403, "quotaExceeded"))
+        assert quota.bucket.tokens == 1000 - 2 * quota.REJECTION_PENALTY
+    finally:
+        quota.bucket = saved
+    print("Success: Only quota and rate-limit rejections are penalized.")
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_burst_limit()
+    test_request_builder_gate()
+    test_rejection_penalty()
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.router import MessageRouter, MAX_REPLY_CHARS
+
+def test_reply_truncation():
+    print("=== Testing Reply Truncation ===")
+    # The formatting helpers don't touch the database or clients
+    router = MessageRouter.__new__(MessageRouter)
+
+    # A dot inside the username is not a sentence end
+    reply = router._format_mention("john.doe", "x" * 230)
+    print(f"Dotted username: {reply[:30]}... ({len(reply)} chars)")
+    assert reply.startswith("@john.doe ")
+    assert len(reply) == MAX_REPLY_CHARS
+    assert reply.endswith("…")
+
+    # An early '!' doesn't throw away the rest of the reply, the cut lands on a word boundary
+    reply = router._format_mention("bob", "Yes! " + "word " * 60)
+    print(f"Early sentence end: {reply[:30]}... ({len(reply)} chars)")
+    assert len(reply) > MAX_REPLY_CHARS // 2
+    assert len(reply) <= MAX_REPLY_CHARS
+    assert reply.endswith("word…")
+
+    # A sentence ending past half the limit is still preferred
+    reply = router._format_mention("bob", "a" * 150 + ". " + "b " * 40)
+    assert reply.endswith(".")
+    assert len(reply) == len("@bob ") + 151
+
+    # Short replies are left alone
+    assert router._format_mention("bob", "hi there") == "@bob hi there"
+    print("Success: Replies are truncated without losing usable text.")
+
+if __name__ == "__main__":
+    test_reply_truncation()